@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 from .models import (
     UserFinancialProfile,
     Transaction,
@@ -8,6 +11,26 @@ from .models import (
 )
 
 
+class EstimatedPaginator(Paginator):
+    """
+    Paginator that reads PostgreSQL's planner row estimate instead of
+    running COUNT(*), which is a full scan on a large transactions table.
+    """
+
+    @cached_property
+    def count(self):
+        if connection.vendor == 'postgresql' and not self.object_list.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                    [self.object_list.model._meta.db_table]
+                )
+                estimate = cursor.fetchone()[0]
+            if estimate >= 0:
+                return estimate
+        return super().count
+
+
 @admin.register(UserFinancialProfile)
 class UserFinancialProfileAdmin(admin.ModelAdmin):
     list_display = [
@@ -19,6 +42,7 @@ class UserFinancialProfileAdmin(admin.ModelAdmin):
         'updated_at'
     ]
     list_filter = ['created_at', 'updated_at']
+    list_select_related = ['user']
     search_fields = ['user__username', 'user__email']
     readonly_fields = ['created_at', 'updated_at']
 
@@ -43,6 +67,7 @@ class TransactionAdmin(admin.ModelAdmin):
         'transaction_source',
         'is_anomaly'
     ]
+    list_select_related = ['user']
     search_fields = [
         'merchant_name',
         'description',
@@ -51,6 +76,26 @@ class TransactionAdmin(admin.ModelAdmin):
     date_hierarchy = 'date'
     readonly_fields = ['created_at', 'updated_at']
     ordering = ['-date', '-created_at']
+    paginator = EstimatedPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # The changelist never renders description; don't fetch it
+        return super().get_queryset(request).defer('description')
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        # Widen the stock icontains search with fuzzy merchant matches via
+        # the pg_trgm GIN index. OR-ing (rather than replacing) keeps every
+        # field in search_fields searchable and keeps short substrings like
+        # "Bill" matching, which trigram similarity alone would drop.
+        if search_term and connection.vendor == 'postgresql':
+            results = results | queryset.filter(
+                merchant_name__trigram_similar=search_term
+            )
+        return results, may_have_duplicates
 
 
 @admin.register(BudgetRecommendation)
@@ -65,11 +110,16 @@ class BudgetRecommendationAdmin(admin.ModelAdmin):
         'generated_at'
     ]
     list_filter = ['month', 'is_active', 'generated_at']
+    list_select_related = ['user']
     search_fields = ['user__username', 'savings_reason']
     readonly_fields = ['generated_at']
     date_hierarchy = 'month'
     ordering = ['-month', '-generated_at']
 
+    def get_queryset(self, request):
+        # The changelist never renders savings_reason; don't fetch it
+        return super().get_queryset(request).defer('savings_reason')
+
 
 @admin.register(CategoryBudget)
 class CategoryBudgetAdmin(admin.ModelAdmin):
@@ -83,6 +133,7 @@ class CategoryBudgetAdmin(admin.ModelAdmin):
         'risk_level'
     ]
     list_filter = ['category', 'risk_level', 'created_at']
+    list_select_related = ['budget_recommendation__user']
     search_fields = [
         'budget_recommendation__user__username',
         'category',
@@ -90,6 +141,18 @@ class CategoryBudgetAdmin(admin.ModelAdmin):
     ]
     readonly_fields = ['created_at']
     ordering = ['budget_recommendation', 'category']
+    raw_id_fields = ['budget_recommendation']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'budget_recommendation__user'
+        ).defer('reason', 'budget_recommendation__savings_reason')
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Render budget choices without one user query per __str__ call
+        if db_field.name == 'budget_recommendation':
+            kwargs['queryset'] = BudgetRecommendation.objects.select_related('user')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(WeeklyBudget)
@@ -104,5 +167,18 @@ class WeeklyBudgetAdmin(admin.ModelAdmin):
         'recommended_weekly_savings'
     ]
     list_filter = ['week_number', 'week_start_date']
+    list_select_related = ['budget_recommendation__user']
     search_fields = ['budget_recommendation__user__username']
-    ordering = ['budget_recommendation', 'week_start_date']
\ No newline at end of file
+    ordering = ['budget_recommendation', 'week_start_date']
+    raw_id_fields = ['budget_recommendation']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'budget_recommendation__user'
+        ).defer('explanation', 'budget_recommendation__savings_reason')
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Render budget choices without one user query per __str__ call
+        if db_field.name == 'budget_recommendation':
+            kwargs['queryset'] = BudgetRecommendation.objects.select_related('user')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
\ No newline at end of file
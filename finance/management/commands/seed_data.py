@@ -1,10 +1,21 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
 from finance.models import UserFinancialProfile, Transaction
 from datetime import datetime, timedelta
 from decimal import Decimal
+import calendar
+import io
 import random
 
+# One paisa -- amounts are generated as integer paise and scaled once
+CENT = Decimal('0.01')
+
+# Transaction source pools (tuples: cheap to sample from, never reallocated)
+SOURCES = ('upi', 'card', 'bank')
+SOURCES_WITH_CASH = ('upi', 'card', 'bank', 'cash')
+
 
 class Command(BaseCommand):
     help = 'Seeds the database with sample financial data for testing'
@@ -16,9 +27,60 @@ class Command(BaseCommand):
             default=3,
             help='Number of months of transaction history to generate (default: 3)'
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Seed for the random generator (makes reseeds reproducible)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Keep existing transactions and only seed months that have none'
+        )
 
+    def _flush(self, pending):
+        """Insert pending Transaction instances via the fastest path available.
+
+        On PostgreSQL this streams rows through COPY, which skips per-row
+        planning and parameter binding; other backends fall back to
+        bulk_create.
+        """
+        if not pending:
+            return
+
+        if connection.vendor != 'postgresql':
+            Transaction.objects.bulk_create(pending, batch_size=1000)
+            return
+
+        now = timezone.now().isoformat()
+        buf = io.StringIO()
+        for txn in pending:
+            buf.write(
+                f'{txn.user_id}\t{txn.amount}\t{txn.date}\t{txn.merchant_name}\t'
+                f'{txn.category}\t{txn.expense_type}\t{txn.transaction_source}\t'
+                f'{txn.description}\t{txn.is_anomaly}\t{now}\t{now}\n'
+            )
+        buf.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.copy_from(
+                buf,
+                'finance_transaction',
+                columns=(
+                    'user_id', 'amount', 'date', 'merchant_name', 'category',
+                    'expense_type', 'transaction_source', 'description',
+                    'is_anomaly', 'created_at', 'updated_at'
+                ),
+                sep='\t'
+            )
+
+    @transaction.atomic
     def handle(self, *args, **options):
         months = options['months']
+        # One Random instance for the whole run: avoids the module-level
+        # lookup on every draw and makes --seed runs reproducible
+        rng = random.Random(options['seed'])
         
         # Create or get test user
         user, created = User.objects.get_or_create(
@@ -53,12 +115,24 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.WARNING(f'! Updated financial profile for {user.username}'))
         
-        # Delete existing transactions for clean slate
-        Transaction.objects.filter(user=user).delete()
-        self.stdout.write(self.style.WARNING(f'! Deleted existing transactions'))
+        incremental = options['incremental']
+
+        if incremental:
+            self.stdout.write(self.style.WARNING(
+                '! Incremental mode: keeping existing transactions and '
+                'skipping already-seeded months'
+            ))
+        else:
+            # Delete existing transactions for clean slate. Transaction has no
+            # FK children, so skip the ORM's fetch-PKs-then-cascade pass and
+            # issue a single bulk DELETE.
+            deleted = Transaction.objects.filter(user=user)._raw_delete(Transaction.objects.db)
+            self.stdout.write(self.style.WARNING(f'! Deleted {deleted} existing transactions'))
         
         # Generate transactions for the last N months
         transactions_created = 0
+        months_skipped = 0
+        pending = []  # Transaction instances awaiting a bulk insert
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=30 * months)
         
@@ -130,135 +204,177 @@ class Command(BaseCommand):
             },
         }
         
-        # Generate transactions month by month
+        # Precompute paise bounds so amounts can be drawn as integers
+        for template in transaction_templates.values():
+            lo, hi = template['amount_range']
+            template['amount_range_paise'] = (lo * 100, hi * 100)
+
+        # One shared description string per merchant: rows with the same
+        # merchant reuse the same str instead of a fresh f-string each
+        all_merchants = {m for t in transaction_templates.values() for m in t['merchants']}
+        descriptions = {m: f'{m} payment' for m in all_merchants}
+
+        # Precompute the month grid once: (start, end clamped to end_date,
+        # day span) per month, so the generation loops do no date arithmetic
+        month_info = []
         current_date = start_date
-        
         while current_date <= end_date:
             month_start = current_date.replace(day=1)
-            
-            # Get the last day of the month
-            if month_start.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(days=1)
-            
-            # Ensure we don't go beyond end_date
-            if month_end > end_date:
-                month_end = end_date
-            
+            last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+            month_end = min(month_start.replace(day=last_day), end_date)
+            month_info.append((month_start, month_end, (month_end - month_start).days))
+            current_date = month_start + timedelta(days=last_day)
+
+        if incremental:
+            # Months that already hold rows for this user are treated as
+            # seeded and skipped wholesale. Duplicate same-day transactions
+            # are legitimate data, so idempotency lives here rather than in
+            # any per-row conflict handling on the table
+            existing_months = set(
+                Transaction.objects.filter(
+                    user=user, date__gte=start_date
+                ).dates('date', 'month')
+            )
+        else:
+            existing_months = set()
+
+        # Generate transactions month by month
+        for month_start, month_end, days_in_month in month_info:
+
+            if month_start in existing_months:
+                self.stdout.write(
+                    f'\nSkipping {month_start.strftime("%B %Y")}: transactions already present'
+                )
+                months_skipped += 1
+                continue
+
             self.stdout.write(f'\nGenerating transactions for {month_start.strftime("%B %Y")}...')
             
             # Generate transactions for each category
             for template_name, template in transaction_templates.items():
+                # Hoist invariant template lookups out of the row loops
+                category = template['category']
+                expense_type = template['expense_type']
+                merchants = template['merchants']
+                amount_range_paise = template['amount_range_paise']
+                is_volatile = category in ('entertainment', 'shopping')
+
                 if template['frequency'] == 'monthly':
-                    # Fixed monthly transactions
+                    # Fixed monthly transactions: one row on the fixed day,
+                    # or num_transactions rows spread across the month --
+                    # never both
                     if 'day_of_month' in template:
                         transaction_date = month_start.replace(day=template['day_of_month'])
+                        if transaction_date <= month_end:
+                            amount = Decimal(rng.randint(*amount_range_paise)) * CENT
+                            merchant = rng.choice(merchants)
+
+                            pending.append(Transaction(
+                                user=user,
+                                amount=amount,
+                                date=transaction_date,
+                                merchant_name=merchant,
+                                category=category,
+                                expense_type=expense_type,
+                                transaction_source=rng.choice(SOURCES),
+                                description=descriptions[merchant]
+                            ))
                     else:
-                        num_transactions = random.randint(*template['transactions_per_month'])
+                        num_transactions = rng.randint(*template['transactions_per_month'])
                         for _ in range(num_transactions):
-                            transaction_date = month_start + timedelta(days=random.randint(0, (month_end - month_start).days))
-                            
-                            amount = Decimal(str(random.uniform(*template['amount_range']))).quantize(Decimal('0.01'))
-                            merchant = random.choice(template['merchants'])
-                            
-                            Transaction.objects.create(
+                            transaction_date = month_start + timedelta(days=rng.randint(0, (month_end - month_start).days))
+
+                            amount = Decimal(rng.randint(*amount_range_paise)) * CENT
+                            merchant = rng.choice(merchants)
+
+                            pending.append(Transaction(
                                 user=user,
                                 amount=amount,
                                 date=transaction_date,
                                 merchant_name=merchant,
-                                category=template['category'],
-                                expense_type=template['expense_type'],
-                                transaction_source=random.choice(['upi', 'card', 'bank']),
-                                description=f'{merchant} payment'
-                            )
-                            transactions_created += 1
-                    
-                    if transaction_date <= month_end:
-                        amount = Decimal(str(random.uniform(*template['amount_range']))).quantize(Decimal('0.01'))
-                        merchant = random.choice(template['merchants'])
-                        
-                        Transaction.objects.create(
-                            user=user,
-                            amount=amount,
-                            date=transaction_date,
-                            merchant_name=merchant,
-                            category=template['category'],
-                            expense_type=template['expense_type'],
-                            transaction_source=random.choice(['upi', 'card', 'bank']),
-                            description=f'{merchant} payment'
-                        )
-                        transactions_created += 1
-                
+                                category=category,
+                                expense_type=expense_type,
+                                transaction_source=rng.choice(SOURCES),
+                                description=descriptions[merchant]
+                            ))
+
                 else:
                     # Variable frequency transactions
-                    num_transactions = random.randint(*template['transactions_per_month'])
-                    
-                    for _ in range(num_transactions):
-                        # Random date within the month
-                        days_in_month = (month_end - month_start).days
-                        random_day = random.randint(0, days_in_month)
+                    num_transactions = rng.randint(*template['transactions_per_month'])
+
+                    # Pre-sample dates, merchants and sources in one batched
+                    # call each instead of per-row rng.choice lookups
+                    days_in_month = (month_end - month_start).days
+                    random_days = rng.choices(range(days_in_month + 1), k=num_transactions)
+                    merchant_picks = rng.choices(merchants, k=num_transactions)
+                    source_picks = rng.choices(SOURCES_WITH_CASH, k=num_transactions)
+                    amount_picks = rng.choices(
+                        range(amount_range_paise[0], amount_range_paise[1] + 1),
+                        k=num_transactions
+                    )
+
+                    for random_day, merchant, source, base_paise in zip(
+                            random_days, merchant_picks, source_picks, amount_picks):
                         transaction_date = month_start + timedelta(days=random_day)
-                        
+
                         if transaction_date > end_date:
                             continue
-                        
-                        # Random amount with some volatility
-                        base_amount = random.uniform(*template['amount_range'])
+
                         # Add 10% volatility for some categories
-                        if template['category'] in ['entertainment', 'shopping']:
-                            volatility = random.uniform(-0.1, 0.3)
-                            amount = base_amount * (1 + volatility)
-                        else:
-                            amount = base_amount
-                        
-                        amount = Decimal(str(amount)).quantize(Decimal('0.01'))
-                        merchant = random.choice(template['merchants'])
-                        
-                        Transaction.objects.create(
+                        if is_volatile:
+                            volatility = rng.uniform(-0.1, 0.3)
+                            base_paise = round(base_paise * (1 + volatility))
+
+                        amount = Decimal(base_paise) * CENT
+
+                        pending.append(Transaction(
                             user=user,
                             amount=amount,
                             date=transaction_date,
                             merchant_name=merchant,
-                            category=template['category'],
-                            expense_type=template['expense_type'],
-                            transaction_source=random.choice(['upi', 'card', 'bank', 'cash']),
-                            description=f'{merchant} payment'
-                        )
-                        transactions_created += 1
+                            category=category,
+                            expense_type=expense_type,
+                            transaction_source=source,
+                            description=descriptions[merchant]
+                        ))
             
             # Add a few anomalies (one-time large expenses)
-            if random.random() > 0.7:  # 30% chance per month
-                anomaly_date = month_start + timedelta(days=random.randint(5, 25))
+            if rng.random() > 0.7:  # 30% chance per month
+                anomaly_date = month_start + timedelta(days=rng.randint(5, 25))
                 if anomaly_date <= end_date:
                     anomaly_categories = ['healthcare', 'shopping', 'other']
-                    anomaly_category = random.choice(anomaly_categories)
+                    anomaly_category = rng.choice(anomaly_categories)
                     anomaly_merchants = {
                         'healthcare': ['Hospital Emergency', 'Dental Clinic', 'Eye Care Center'],
                         'shopping': ['Electronics Store', 'Furniture Store', 'Appliance Store'],
                         'other': ['Home Repair', 'Car Service', 'Event Expense']
                     }
                     
-                    Transaction.objects.create(
+                    pending.append(Transaction(
                         user=user,
-                        amount=Decimal(str(random.uniform(5000, 15000))).quantize(Decimal('0.01')),
+                        amount=Decimal(rng.randint(500000, 1500000)) * CENT,
                         date=anomaly_date,
-                        merchant_name=random.choice(anomaly_merchants[anomaly_category]),
+                        merchant_name=rng.choice(anomaly_merchants[anomaly_category]),
                         category=anomaly_category,
                         expense_type='discretionary',
                         transaction_source='card',
                         description='One-time large expense',
                         is_anomaly=True
-                    )
-                    transactions_created += 1
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1, day=1)
+                    ))
+
+            # Flush the month's rows in one batched write
+            self._flush(pending)
+            transactions_created += len(pending)
+            pending = []
+
         
+        # Every pending row is inserted unconditionally, so this count is
+        # the number of rows actually written, not merely attempted
         self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully created {transactions_created} transactions'))
+        if months_skipped:
+            self.stdout.write(self.style.WARNING(
+                f'! Skipped {months_skipped} already-seeded month(s)'
+            ))
         self.stdout.write(self.style.SUCCESS(f'✓ Data spans from {start_date} to {end_date}'))
         self.stdout.write(self.style.SUCCESS(f'\n🎉 Seed data generation complete!'))
         self.stdout.write(self.style.SUCCESS(f'\nYou can now login with:'))
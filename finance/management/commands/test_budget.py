@@ -15,38 +15,46 @@ class Command(BaseCommand):
         except User.DoesNotExist:
             self.stdout.write(self.style.ERROR('Test user not found. Run seed_data first.'))
             return
-        
-        self.stdout.write(self.style.SUCCESS(f'\n🧠 Testing Budget Engine for {user.username}...\n'))
-        
+
+        # Buffer output and flush once at the end instead of a write (and
+        # stream flush) per line
+        lines = [self.style.SUCCESS(f'\n🧠 Testing Budget Engine for {user.username}...\n')]
+
         # Initialize service
         service = BudgetCalculationService(user)
-        
+
         # Generate budget recommendation
         try:
+            # The service returns the serialized payload with the category
+            # and weekly breakdowns already embedded
             budget = service.generate_budget_recommendation()
-            
-            self.stdout.write(self.style.SUCCESS(f'✓ Budget generated for {budget.month.strftime("%B %Y")}'))
-            self.stdout.write(f'\n📊 BUDGET SUMMARY:')
-            self.stdout.write(f'  Total Budget: ₹{budget.total_recommended_budget}')
-            self.stdout.write(f'  Recommended Savings: ₹{budget.recommended_savings}')
-            self.stdout.write(f'  Reason: {budget.savings_reason}\n')
-            
-            self.stdout.write(f'📋 CATEGORY BREAKDOWN:')
-            for cat_budget in budget.category_budgets.all():
-                self.stdout.write(f'\n  {cat_budget.category.upper()}:')
-                self.stdout.write(f'    Recommended: ₹{cat_budget.recommended_limit}')
-                self.stdout.write(f'    Your Average: ₹{cat_budget.actual_average}')
-                self.stdout.write(f'    Variance: ₹{cat_budget.variance}')
-                self.stdout.write(f'    Risk: {cat_budget.risk_level}')
-                self.stdout.write(f'    💡 {cat_budget.reason}')
-            
-            self.stdout.write(f'\n📅 WEEKLY BUDGETS:')
-            for week in budget.weekly_budgets.all():
-                self.stdout.write(f'\n  Week {week.week_number} ({week.week_start_date} to {week.week_end_date}):')
-                self.stdout.write(f'    Spending: ₹{week.recommended_weekly_spending}')
-                self.stdout.write(f'    Savings: ₹{week.recommended_weekly_savings}')
-            
-            self.stdout.write(self.style.SUCCESS(f'\n\n🎉 Budget engine test successful!'))
-            
+
+            lines.append(self.style.SUCCESS(f'✓ Budget generated for {budget["month_display"]}'))
+            lines.append(f'\n📊 BUDGET SUMMARY:')
+            lines.append(f'  Total Budget: ₹{budget["total_recommended_budget"]}')
+            lines.append(f'  Recommended Savings: ₹{budget["recommended_savings"]}')
+            lines.append(f'  Reason: {budget["savings_reason"]}\n')
+
+            lines.append(f'📋 CATEGORY BREAKDOWN:')
+            for cat_budget in budget['category_budgets']:
+                lines.append(f'\n  {cat_budget["category"].upper()}:')
+                lines.append(f'    Recommended: ₹{cat_budget["recommended_limit"]}')
+                lines.append(f'    Your Average: ₹{cat_budget["actual_average"]}')
+                lines.append(f'    Variance: ₹{cat_budget["variance"]}')
+                lines.append(f'    Risk: {cat_budget["risk_level"]}')
+                lines.append(f'    💡 {cat_budget["reason"]}')
+
+            lines.append(f'\n📅 WEEKLY BUDGETS:')
+            for week in budget['weekly_budgets']:
+                lines.append(f'\n  Week {week["week_number"]} ({week["week_start_date"]} to {week["week_end_date"]}):')
+                lines.append(f'    Spending: ₹{week["recommended_weekly_spending"]}')
+                lines.append(f'    Savings: ₹{week["recommended_weekly_savings"]}')
+
+            lines.append(self.style.SUCCESS(f'\n\n🎉 Budget engine test successful!'))
+
+            self.stdout.write('\n'.join(lines))
+
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error: {str(e)}'))
\ No newline at end of file
+            # Flush what we have so far, then the error
+            self.stdout.write('\n'.join(lines))
+            self.stdout.write(self.style.ERROR(f'Error: {str(e)}'))
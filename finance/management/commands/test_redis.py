@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.cache import cache
+
+
+class Command(BaseCommand):
+    help = 'Smoke test for the cache backend (pipelined when Redis is configured)'
+
+    def handle(self, *args, **options):
+        backend = settings.CACHES['default']['BACKEND']
+
+        self.stdout.write(self.style.SUCCESS(f'\n🔍 Testing cache backend...\n'))
+        self.stdout.write(f'  Backend: {backend}')
+
+        try:
+            if 'redis' in backend.lower():
+                # Batch every command through one pipeline so the test pays
+                # a single network round-trip instead of one per command --
+                # the same pattern callers should use for multi-key fills
+                from django_redis import get_redis_connection
+
+                con = get_redis_connection('default')
+                pipe = con.pipeline()
+                pipe.set('test_key', 'Hello Redis!', ex=60)
+                pipe.get('test_key')
+                pipe.set('counter', 1)
+                pipe.incr('counter')
+                pipe.get('counter')
+                _, value, _, _, counter = pipe.execute()
+                value = value.decode()
+                counter = int(counter)
+            else:
+                cache.set('test_key', 'Hello Redis!', 60)
+                value = cache.get('test_key')
+                cache.set('counter', 1)
+                cache.incr('counter')
+                counter = cache.get('counter')
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'\n❌ Cache error: {e}'))
+            self.stdout.write('💡 Make sure the cache backend (e.g. redis-server) is running.')
+            return
+
+        if value == 'Hello Redis!':
+            self.stdout.write(self.style.SUCCESS(f'  ✅ Set/get round-trip OK: {value!r}'))
+        else:
+            self.stdout.write(self.style.ERROR(f"  ❌ Expected 'Hello Redis!' but got: {value!r}"))
+
+        if counter == 2:
+            self.stdout.write(self.style.SUCCESS(f'  ✅ Counter increment OK: {counter}'))
+        else:
+            self.stdout.write(self.style.ERROR(f'  ❌ Counter test failed: {counter} (expected: 2)'))
+
+        self.stdout.write(self.style.SUCCESS('\n🎉 Cache test complete!'))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-08-29 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'category', 'date'], name='finance_tra_user_id_9a8847_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'is_anomaly'], name='finance_tra_user_id_5146df_idx'),
+        ),
+    ]
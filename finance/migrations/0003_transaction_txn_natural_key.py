@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-08-29 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_transaction_finance_tra_user_id_9a8847_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(fields=('user', 'date', 'merchant_name', 'amount', 'description'), name='txn_natural_key'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.27 on 2026-08-29 21:09
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_transaction_txn_natural_key'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['merchant_name'], name='txn_merchant_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-08-29 21:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_transaction_txn_merchant_trgm'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='finance_tra_user_id_5146df_idx',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'is_anomaly', 'date'], name='finance_tra_user_id_34972b_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-08-29 21:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_remove_transaction_finance_tra_user_id_5146df_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='transaction',
+            name='txn_natural_key',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-08-29 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_remove_transaction_txn_natural_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budgetrecommendation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
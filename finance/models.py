@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
@@ -87,8 +88,10 @@ class Transaction(models.Model):
     Individual transaction record
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions')
-    
+
     # Transaction details
+    # Amounts are stored as rupee decimals: the API serializes these fields
+    # directly, so they must stay DecimalField rather than integer paise
     amount = models.DecimalField(
         max_digits=10, 
         decimal_places=2,
@@ -128,7 +131,14 @@ class Transaction(models.Model):
         ordering = ['-date', '-created_at']
         indexes = [
             models.Index(fields=['user', 'date']),
+            models.Index(fields=['user', 'category', 'date']),
+            # Matches the analysis filter shape: equality on user and
+            # is_anomaly, then a range scan over date
+            models.Index(fields=['user', 'is_anomaly', 'date']),
             models.Index(fields=['category']),
+            # Trigram index so admin substring search on merchant names
+            # doesn't sequential-scan the table (requires pg_trgm)
+            GinIndex(name='txn_merchant_trgm', fields=['merchant_name'], opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
@@ -163,6 +173,7 @@ class BudgetRecommendation(models.Model):
     
     # Timestamps
     generated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
     class Meta:
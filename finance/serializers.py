@@ -114,7 +114,16 @@ class BudgetRecommendationSerializer(serializers.ModelSerializer):
             'is_active'
         ]
         read_only_fields = ['id', 'generated_at']
-    
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Prefetch everything this serializer renders, so serializing a
+        list of recommendations stays at a fixed query count instead of
+        two child queries per row."""
+        return queryset.select_related('user').prefetch_related(
+            'category_budgets', 'weekly_budgets'
+        )
+
     def get_month_display(self, obj):
         return obj.month.strftime('%B %Y')
 
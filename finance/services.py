@@ -1,10 +1,20 @@
+import calendar
+import heapq
+from bisect import bisect_right
 from decimal import Decimal
 from datetime import datetime, timedelta
-from django.db.models import Avg, Sum, Count, StdDev, Q
+from functools import cached_property
+from django.db.models import (
+    Avg, Sum, Count, Max, StdDev, Q, Prefetch,
+    ExpressionWrapper, F, FloatField
+)
+from django.db.models.functions import NullIf
 from django.core.cache import cache
+from django.db import transaction
 import logging
 
 from .models import (
+    CATEGORY_CHOICES,
     Transaction,
     UserFinancialProfile,
     BudgetRecommendation,
@@ -12,8 +22,95 @@ from .models import (
     WeeklyBudget
 )
 
+from .serializers import BudgetRecommendationSerializer
+
 logger = logging.getLogger(__name__)
 
+# Category code -> human-readable name, resolved once instead of walking
+# the model field's choices on every get_category_display() call
+CATEGORY_DISPLAY = dict(CATEGORY_CHOICES)
+
+# Severity ranking for adherence insights, most critical first
+INSIGHT_ORDER = {'danger': 0, 'warning': 1, 'success': 2}
+
+# Decimal constants reused in the per-category loops; Decimal(str)
+# parses its argument, so build each one once at import time
+_ZERO = Decimal('0.00')
+_ONE = Decimal('1')
+_BUF_FIXED = Decimal('0.05')   # 5% buffer for fixed expenses
+_BUF_LOW = Decimal('0.10')     # 10% for low volatility
+_BUF_MED = Decimal('0.15')     # 15% for moderate volatility
+_BUF_HIGH = Decimal('0.20')    # 20% for high volatility
+_SAVE_HIGH = Decimal('0.70')   # save 70% of available at high confidence
+_SAVE_MED = Decimal('0.50')    # 50% at moderate confidence
+_SAVE_LOW = Decimal('0.30')    # 30% when volatility calls for a buffer
+
+# Volatility band edges and the (buffer, risk, template band) treatment
+# for each band, replacing a per-category if/elif ladder with one bisect
+# plus a tuple lookup. Fixed expenses bypass the bands entirely
+_VOLATILITY_BINS = (10, 30)
+_BUFFER_TABLE = (
+    (_BUF_LOW, 'low', 'low'),
+    (_BUF_MED, 'medium', 'medium'),
+    (_BUF_HIGH, 'high', 'high'),
+)
+_FIXED_TREATMENT = (_BUF_FIXED, 'low', 'fixed')
+
+# Explanation templates by volatility band; only the dynamic fields are
+# formatted per category, the prose itself is built once at import
+_REASON_TEMPLATES = {
+    'fixed': "Your {name} is a fixed expense at ₹{avg:,.0f}/month. Added minimal 5% buffer.",
+    'low': "Your {name} spending is stable at ₹{avg:,.0f}/month. Added {buffer:.0f}% buffer for minor fluctuations.",
+    'medium': "{name} shows moderate variation (±{volatility:.1f}%). Recommended ₹{limit:,.0f} with {buffer:.0f}% safety buffer.",
+    'high': "⚠️ {name} spending is highly irregular (volatility: {volatility:.1f}%). Added {buffer:.0f}% buffer or consider reducing spending.",
+}
+
+# The monthly split is a fixed four weeks, so the per-week explanation
+# strings are constants, not something to rebuild per budget run
+_WEEK_EXPLANATIONS = (
+    "Week 1 budget based on monthly allocation. Start strong!",
+    "Week 2 budget based on monthly allocation.",
+    "Week 3 budget based on monthly allocation.",
+    "Week 4 budget based on monthly allocation. Final week - stay on track!",
+)
+
+# How long a materialized per-category actuals map stays cached
+ACTUALS_CACHE_TIMEOUT = 600  # 10 minutes
+
+# Sentinel distinguishing "key absent" from a cached None result
+_CACHE_MISS = object()
+
+
+def _month_bounds(d):
+    """First day, last day and day count of d's month, in one place
+    instead of per-call monthrange/replace arithmetic."""
+    last = calendar.monthrange(d.year, d.month)[1]
+    return d.replace(day=1), d.replace(day=last), last
+
+
+def _monthly_actuals(user, start, end, include_anomalies=False):
+    """
+    Per-category spending totals for a date range, as a dict.
+
+    The comparison and adherence paths both need this exact aggregation;
+    memoizing the materialized map means a session that requests both
+    only runs the GROUP BY once.
+    """
+    cache_key = f'actuals_{user.id}_{start}_{end}_{include_anomalies}'
+    actuals = cache.get(cache_key)
+    if actuals is not None:
+        return actuals
+
+    qs = Transaction.objects.filter(user=user, date__gte=start, date__lte=end)
+    if not include_anomalies:
+        qs = qs.filter(is_anomaly=False)
+
+    actuals = dict(qs.values('category').annotate(
+        total=Sum('amount')
+    ).values_list('category', 'total'))
+    cache.set(cache_key, actuals, ACTUALS_CACHE_TIMEOUT)
+    return actuals
+
 
 class BudgetCalculationService:
     """
@@ -27,8 +124,13 @@ class BudgetCalculationService:
     
     def __init__(self, user):
         self.user = user
-        self.profile, _ = UserFinancialProfile.objects.get_or_create(
-            user=user,
+
+    @cached_property
+    def profile(self):
+        # Loaded on first use: callers that only compare or analyze
+        # never pay the profile SELECT (plus possible INSERT)
+        profile, _ = UserFinancialProfile.objects.get_or_create(
+            user=self.user,
             defaults={
                 'monthly_income': Decimal('50000.00'),
                 'income_stability_score': 85.0,
@@ -36,10 +138,15 @@ class BudgetCalculationService:
                 'savings_confidence_indicator': 0.0
             }
         )
+        return profile
     
     def generate_budget_recommendation(self, target_month=None):
         """
-        Generate intelligent budget recommendation with caching
+        Generate intelligent budget recommendation with caching.
+
+        Returns the serialized payload (BudgetRecommendationSerializer
+        data), so cache hits are ready to send without touching the
+        database or re-pickling model instances.
         """
         if target_month is None:
             target_month = datetime.now().date().replace(day=1)
@@ -47,149 +154,208 @@ class BudgetCalculationService:
         # Check cache first
         cache_key = f'budget_{self.user.id}_{target_month.strftime("%Y-%m")}'
         cached_budget = cache.get(cache_key)
-        
+
         if cached_budget:
-            logger.info(f"✅ Cache HIT for budget {cache_key}")
+            logger.info("✅ Cache HIT for budget %s", cache_key)
             return cached_budget
         
-        logger.info(f"❌ Cache MISS for budget {cache_key} - Generating new...")
+        logger.info("❌ Cache MISS for budget %s - Generating new...", cache_key)
         
-        # Validate sufficient data
-        transaction_count = Transaction.objects.filter(user=self.user).count()
+        # Analyze spending patterns (OPTIMIZED with single query)
+        analysis = self._analyze_spending_patterns_optimized(months_to_analyze=3)
+
+        # Validate sufficient data -- the analysis already counted the
+        # analyzed transactions, so no separate COUNT query is needed
+        transaction_count = analysis['transaction_count']
         if transaction_count < 30:
             raise ValueError(
                 f"Insufficient transaction data. Need at least 30 transactions "
                 f"for reliable recommendations. Current count: {transaction_count}"
             )
         
-        # Analyze spending patterns (OPTIMIZED with single query)
-        analysis = self._analyze_spending_patterns_optimized(months_to_analyze=3)
-        
-        # Calculate category budgets
-        category_budgets_data = self._calculate_category_budgets(analysis, target_month)
-        
-        # Calculate total budget
-        total_budget = sum(cat['recommended_limit'] for cat in category_budgets_data)
+        # Calculate category budgets and their total in one pass
+        category_budgets_data, total_budget = self._calculate_category_budgets(
+            analysis, target_month
+        )
         
         # Calculate recommended savings
         savings_data = self._calculate_recommended_savings(total_budget, analysis)
         
-        # Create or update budget recommendation
-        budget, created = BudgetRecommendation.objects.update_or_create(
-            user=self.user,
-            month=target_month,
-            defaults={
-                'recommended_savings': savings_data['amount'],
-                'savings_reason': savings_data['reason'],
-                'total_recommended_budget': total_budget,
-                'is_active': True
-            }
-        )
-        
-        # Clear old category and weekly budgets
-        CategoryBudget.objects.filter(budget_recommendation=budget).delete()
-        WeeklyBudget.objects.filter(budget_recommendation=budget).delete()
-        
-        # Create category budgets
-        for cat_data in category_budgets_data:
-            CategoryBudget.objects.create(
-                budget_recommendation=budget,
-                **cat_data
+        # All the writes commit together: one transaction instead of a
+        # commit per statement on autocommit, and no reader ever sees a
+        # recommendation with its breakdowns half-replaced
+        with transaction.atomic():
+            # Create or update budget recommendation
+            budget, created = BudgetRecommendation.objects.update_or_create(
+                user=self.user,
+                month=target_month,
+                defaults={
+                    'recommended_savings': savings_data['amount'],
+                    'savings_reason': savings_data['reason'],
+                    'total_recommended_budget': total_budget,
+                    'is_active': True
+                }
             )
-        
-        # Generate weekly budgets
-        self._generate_weekly_budgets(budget, target_month, total_budget, savings_data['amount'])
-        
-        # Update user's financial health scores
-        self._update_financial_health_scores(analysis)
-        
-        # Cache the result
-        cache.set(cache_key, budget, self.BUDGET_CACHE_TIMEOUT)
-        logger.info(f"💾 Cached budget for {cache_key}")
-        
-        return budget
+
+            # Upsert category budgets in one INSERT .. ON CONFLICT on the
+            # (recommendation, category) natural key, instead of wiping
+            # and reinserting rows that mostly carry the same categories
+            CategoryBudget.objects.bulk_create([
+                CategoryBudget(budget_recommendation=budget, **cat_data)
+                for cat_data in category_budgets_data
+            ], batch_size=100, update_conflicts=True,
+                unique_fields=['budget_recommendation', 'category'],
+                update_fields=[
+                    'recommended_limit', 'actual_average', 'variance',
+                    'risk_level', 'reason'
+                ])
+
+            # Drop categories that fell out of this run's analysis
+            CategoryBudget.objects.filter(
+                budget_recommendation=budget
+            ).exclude(
+                category__in=[cat_data['category'] for cat_data in category_budgets_data]
+            ).delete()
+
+            # Generate weekly budgets
+            self._generate_weekly_budgets(budget, target_month, total_budget, savings_data['amount'])
+
+            # Update user's financial health scores
+            self._update_financial_health_scores(analysis)
+
+        # Cache the fully serialized payload, not the model instance: a
+        # hit then returns a ready-to-send dict with zero DB work instead
+        # of an unpickled model whose relations still query on access
+        payload = BudgetRecommendationSerializer(
+            BudgetRecommendationSerializer.setup_eager_loading(
+                BudgetRecommendation.objects.all()
+            ).get(pk=budget.pk)
+        ).data
+        cache.set(cache_key, payload, self.BUDGET_CACHE_TIMEOUT)
+        logger.info("💾 Cached budget for %s", cache_key)
+
+        return payload
     
     def _analyze_spending_patterns_optimized(self, months_to_analyze=3):
         """
         OPTIMIZED: Single database query with aggregation
         """
-        # Check cache first
-        cache_key = f'spending_analysis_{self.user.id}_{months_to_analyze}m'
+        # Version the cache key by the newest transaction edit: any
+        # write bumps updated_at, the key changes, and stale entries
+        # simply age out -- no signal plumbing needed. The Max probe is
+        # one cheap indexed query
+        latest = Transaction.objects.filter(user=self.user).aggregate(
+            m=Max('updated_at')
+        )['m']
+        version = latest.timestamp() if latest else 0
+        cache_key = f'spending_analysis_{self.user.id}_{months_to_analyze}m_{version}'
         cached_analysis = cache.get(cache_key)
-        
+
         if cached_analysis:
-            logger.info(f"✅ Cache HIT for analysis {cache_key}")
+            logger.info("✅ Cache HIT for analysis %s", cache_key)
             return cached_analysis
         
-        logger.info(f"❌ Cache MISS for analysis {cache_key} - Analyzing...")
+        logger.info("❌ Cache MISS for analysis %s - Analyzing...", cache_key)
         
         # Calculate date range
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=30 * months_to_analyze)
         
-        # OPTIMIZED: Single aggregated query instead of multiple queries
-        category_stats = Transaction.objects.filter(
+        base_qs = Transaction.objects.filter(
             user=self.user,
             date__gte=start_date,
             date__lte=end_date,
             is_anomaly=False
-        ).values('category', 'expense_type').annotate(
+        )
+
+        # OPTIMIZED: two constant-size queries instead of per-category
+        # round-trips. Stats group strictly by category so each category
+        # yields exactly one row; volatility (stddev as % of mean) is
+        # computed per group right in SQL, with NullIf guarding the
+        # division when a group's average is zero
+        category_stats = base_qs.values('category').annotate(
             avg_amount=Avg('amount'),
             total_amount=Sum('amount'),
             count=Count('id'),
             std_dev=StdDev('amount')
+        ).annotate(
+            volatility=ExpressionWrapper(
+                F('std_dev') * 100.0 / NullIf(F('avg_amount'), 0),
+                output_field=FloatField()
+            )
         ).order_by('category')
+
+        # A category can mix expense types across transactions; its
+        # budget treatment follows the dominant one. One unordered
+        # grouped query; the handful of rows it returns is cheaper to
+        # max over in Python than to sort in the database
+        etype_rows = base_qs.values('category', 'expense_type').annotate(
+            c=Count('id')
+        ).order_by()
+        dominant_etype = {}
+        best_count = {}
+        for row in etype_rows:
+            category = row['category']
+            if row['c'] > best_count.get(category, 0):
+                best_count[category] = row['c']
+                dominant_etype[category] = row['expense_type']
         
         # Process results
         analysis = {
             'categories': {},
-            'total_spending': Decimal('0.00'),
+            'total_spending': _ZERO,
             'transaction_count': 0,
             'start_date': start_date,
             'end_date': end_date
         }
         
+        volatility_sum = 0.0
+        num_groups = 0
         for stat in category_stats:
             category = stat['category']
-            avg = Decimal(str(stat['avg_amount'] or 0))
-            std = Decimal(str(stat['std_dev'] or 0))
-            
-            # Calculate volatility
-            volatility = (std / avg * 100) if avg > 0 else Decimal('0.00')
-            
+            # Avg/Sum on a DecimalField already come back as Decimal;
+            # StdDev and the volatility annotation return floats
+            avg = stat['avg_amount'] or _ZERO
+            total = stat['total_amount'] or _ZERO
+            std = stat['std_dev'] or 0.0
+            volatility = stat['volatility'] or 0.0
+            volatility_sum += volatility
+            num_groups += 1
+
             analysis['categories'][category] = {
                 'average': avg,
-                'total': Decimal(str(stat['total_amount'] or 0)),
+                'total': total,
                 'count': stat['count'],
                 'std_dev': std,
                 'volatility': volatility,
-                'expense_type': stat['expense_type'] or 'discretionary'
+                'expense_type': dominant_etype.get(category) or 'discretionary'
             }
-            
-            analysis['total_spending'] += Decimal(str(stat['total_amount'] or 0))
+
+            analysis['total_spending'] += total
             analysis['transaction_count'] += stat['count']
         
-        # Calculate overall volatility
-        if analysis['categories']:
-            avg_volatility = sum(
-                cat['volatility'] for cat in analysis['categories'].values()
-            ) / len(analysis['categories'])
-            analysis['overall_volatility'] = float(avg_volatility)
-        else:
-            analysis['overall_volatility'] = 0.0
+        # Overall volatility falls out of the rows already fetched: the
+        # annotated per-group ratios were summed during the loop, so no
+        # second aggregate query is needed
+        analysis['overall_volatility'] = (
+            volatility_sum / num_groups if num_groups else 0.0
+        )
         
         # Cache the analysis
         cache.set(cache_key, analysis, self.STATS_CACHE_TIMEOUT)
-        logger.info(f"💾 Cached analysis for {cache_key}")
+        logger.info("💾 Cached analysis for %s", cache_key)
         
         return analysis
     
     def _calculate_category_budgets(self, analysis, target_month):
         """
-        Calculate recommended budget for each category with intelligent buffering
+        Calculate recommended budget for each category with intelligent
+        buffering. Returns the per-category list and its running total,
+        saving the caller a second pass of Decimal additions.
         """
         category_budgets = []
-        
+        total_budget = _ZERO
+
         for category, stats in analysis['categories'].items():
             avg = stats['average']
             volatility = stats['volatility']
@@ -197,25 +363,20 @@ class BudgetCalculationService:
             
             # Intelligent buffer based on volatility and expense type
             if expense_type == 'fixed':
-                buffer_percent = Decimal('0.05')  # 5% for fixed expenses
-                risk_level = 'low'
-            elif volatility < 10:
-                buffer_percent = Decimal('0.10')  # 10% for low volatility
-                risk_level = 'low'
-            elif volatility < 30:
-                buffer_percent = Decimal('0.15')  # 15% for moderate volatility
-                risk_level = 'medium'
+                buffer_percent, risk_level, band = _FIXED_TREATMENT
             else:
-                buffer_percent = Decimal('0.20')  # 20% for high volatility
-                risk_level = 'high'
-            
+                buffer_percent, risk_level, band = _BUFFER_TABLE[
+                    bisect_right(_VOLATILITY_BINS, volatility)
+                ]
+
             # Calculate recommended limit
-            recommended_limit = avg * (1 + buffer_percent)
+            recommended_limit = avg * (_ONE + buffer_percent)
             variance = recommended_limit - avg
+            total_budget += recommended_limit
             
             # Generate explanation
             reason = self._generate_category_explanation(
-                category, avg, volatility, buffer_percent, expense_type, risk_level
+                category, avg, volatility, buffer_percent, band
             )
             
             category_budgets.append({
@@ -226,43 +387,46 @@ class BudgetCalculationService:
                 'risk_level': risk_level,
                 'reason': reason
             })
-        
-        return category_budgets
+
+        return category_budgets, total_budget
     
-    def _generate_category_explanation(self, category, avg, volatility, buffer, expense_type, risk):
+    def _generate_category_explanation(self, category, avg, volatility, buffer, band):
         """Generate human-readable explanation"""
-        category_name = category.replace('_', ' ').title()
-        
-        if expense_type == 'fixed':
-            return f"Your {category_name} is a fixed expense at ₹{avg:,.0f}/month. Added minimal 5% buffer."
-        
-        if volatility < 10:
-            return f"Your {category_name} spending is stable at ₹{avg:,.0f}/month. Added {buffer*100:.0f}% buffer for minor fluctuations."
-        elif volatility < 30:
-            return f"{category_name} shows moderate variation (±{volatility:.1f}%). Recommended ₹{avg * (1 + buffer):,.0f} with {buffer*100:.0f}% safety buffer."
-        else:
-            return f"⚠️ {category_name} spending is highly irregular (volatility: {volatility:.1f}%). Added {buffer*100:.0f}% buffer or consider reducing spending."
+        # Same display-name map the adherence insights use, instead of
+        # re-deriving a name from the code with replace/title each call
+        category_name = CATEGORY_DISPLAY.get(category) or category.replace('_', ' ').title()
+
+        return _REASON_TEMPLATES[band].format(
+            name=category_name,
+            avg=avg,
+            volatility=volatility,
+            buffer=buffer * 100,
+            limit=avg * (_ONE + buffer)
+        )
     
     def _calculate_recommended_savings(self, total_budget, analysis):
         """Calculate realistic savings recommendation"""
         monthly_income = self.profile.monthly_income
         available_for_savings = monthly_income - total_budget
-        
-        volatility = Decimal(str(analysis['overall_volatility']))
+
+        # Volatility is a statistic, not money: keep it float instead of
+        # round-tripping through Decimal(str(...))
+        volatility = analysis['overall_volatility']
         
         # Savings confidence based on volatility
         if volatility < 20:
-            savings_percent = Decimal('0.70')  # Can save 70% of available
+            savings_percent = _SAVE_HIGH
             confidence = "high"
         elif volatility < 40:
-            savings_percent = Decimal('0.50')  # Save 50%
+            savings_percent = _SAVE_MED
             confidence = "moderate"
         else:
-            savings_percent = Decimal('0.30')  # Save only 30% (keep buffer)
+            savings_percent = _SAVE_LOW
             confidence = "low"
         
         recommended_savings = available_for_savings * savings_percent
-        savings_percent_of_income = (recommended_savings / monthly_income * 100)
+        # Display-only figure: float division is plenty for the message
+        savings_percent_of_income = float(recommended_savings) / float(monthly_income) * 100.0
         
         # Generate explanation
         if confidence == "high":
@@ -280,66 +444,89 @@ class BudgetCalculationService:
     
     def _generate_weekly_budgets(self, budget, target_month, total_budget, total_savings):
         """Generate weekly breakdown of budget"""
-        import calendar
-        
-        num_weeks = 4
+        num_weeks = len(_WEEK_EXPLANATIONS)
         weekly_spending = total_budget / num_weeks
         weekly_savings = total_savings / num_weeks
-        
+
+        # Month boundaries are loop-invariant: resolve them once instead
+        # of re-running replace()/monthrange() for every week
+        month_first, month_last, _ = _month_bounds(target_month)
+
+        weekly_budgets = []
         for week_num in range(1, num_weeks + 1):
-            week_start = target_month.replace(day=1) + timedelta(weeks=week_num-1)
-            week_end = week_start + timedelta(days=6)
-            
-            if week_end.month != target_month.month:
-                week_end = target_month.replace(day=calendar.monthrange(target_month.year, target_month.month)[1])
-            
-            explanation = f"Week {week_num} budget based on monthly allocation."
-            if week_num == 1:
-                explanation += " Start strong!"
-            elif week_num == num_weeks:
-                explanation += " Final week - stay on track!"
-            
-            WeeklyBudget.objects.create(
+            week_start = month_first + timedelta(weeks=week_num-1)
+            week_end = min(week_start + timedelta(days=6), month_last)
+
+            weekly_budgets.append(WeeklyBudget(
                 budget_recommendation=budget,
                 week_number=week_num,
                 week_start_date=week_start,
                 week_end_date=week_end,
                 recommended_weekly_spending=weekly_spending,
                 recommended_weekly_savings=weekly_savings,
-                explanation=explanation
-            )
+                explanation=_WEEK_EXPLANATIONS[week_num - 1]
+            ))
+
+        # One batched upsert for all four weeks, keyed on the
+        # (recommendation, week_number) natural key
+        WeeklyBudget.objects.bulk_create(
+            weekly_budgets,
+            update_conflicts=True,
+            unique_fields=['budget_recommendation', 'week_number'],
+            update_fields=[
+                'week_start_date', 'week_end_date',
+                'recommended_weekly_spending', 'recommended_weekly_savings',
+                'explanation'
+            ]
+        )
     
     def _update_financial_health_scores(self, analysis):
         """Update user's financial health indicators"""
         volatility = analysis['overall_volatility']
-        
+
         # Expense volatility score (0-100, lower is better)
-        self.profile.expense_volatility_score = min(100.0, volatility)
-        
+        volatility_score = min(100.0, volatility)
+
         # Savings confidence (inverse of volatility)
-        self.profile.savings_confidence_indicator = max(0.0, 100.0 - volatility)
-        
-        self.profile.save()
+        confidence = max(0.0, 100.0 - volatility)
+
+        # Regenerating over unchanged data lands here with identical
+        # scores; skip the UPDATE entirely in that case
+        if (round(volatility_score, 2) == round(self.profile.expense_volatility_score, 2)
+                and round(confidence, 2) == round(self.profile.savings_confidence_indicator, 2)):
+            return
+
+        self.profile.expense_volatility_score = volatility_score
+        self.profile.savings_confidence_indicator = confidence
+
+        # Only the two scores changed; don't rewrite the whole row.
+        # updated_at is auto_now, so it must be named to still be bumped.
+        self.profile.save(update_fields=[
+            'expense_volatility_score',
+            'savings_confidence_indicator',
+            'updated_at'
+        ])
     
     def compare_budget_vs_actual(self, budget):
         """Compare budget recommendation vs actual spending"""
-        month_start = budget.month
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        month_start, month_end, _ = _month_bounds(budget.month)
         
-        # OPTIMIZED: Single aggregated query
-        actual_spending = Transaction.objects.filter(
-            user=self.user,
-            date__gte=month_start,
-            date__lte=month_end
-        ).values('category').annotate(
-            total=Sum('amount')
+        # The comparison counts anomalous spending too -- an ignored
+        # one-off purchase still ate into the month's budget
+        actual_by_category = _monthly_actuals(
+            self.user, month_start, month_end, include_anomalies=True
         )
-        
-        actual_by_category = {item['category']: item['total'] for item in actual_spending}
-        
+
+        # Materialize the category budgets once for the comparison loop.
+        # .all() reuses the prefetch cache when the caller fetched the
+        # recommendation through setup_eager_loading (as the viewset
+        # does); a narrowed .only() queryset would force a fresh query
+        cat_budgets = list(budget.category_budgets.all())
+
         comparisons = []
-        for cat_budget in budget.category_budgets.all():
-            actual = Decimal(str(actual_by_category.get(cat_budget.category, 0)))
+        for cat_budget in cat_budgets:
+            # Sum over a DecimalField already comes back as Decimal
+            actual = actual_by_category.get(cat_budget.category, _ZERO)
             difference = cat_budget.recommended_limit - actual
             percentage = (actual / cat_budget.recommended_limit * 100) if cat_budget.recommended_limit > 0 else 0
             
@@ -359,49 +546,53 @@ def calculate_budget_adherence(user):
     """
     Calculate budget adherence score with caching
     """
-    # Check cache
+    # Check cache; a stored None means "no active budget" and is cached
+    # too, so repeat calls without a budget skip the DB probe
     cache_key = f'adherence_{user.id}_{datetime.now().strftime("%Y-%m")}'
-    cached_score = cache.get(cache_key)
-    
-    if cached_score:
-        logger.info(f"✅ Cache HIT for adherence {cache_key}")
+    cached_score = cache.get(cache_key, _CACHE_MISS)
+
+    if cached_score is not _CACHE_MISS:
+        logger.info("✅ Cache HIT for adherence %s", cache_key)
         return cached_score
-    
-    logger.info(f"❌ Cache MISS for adherence {cache_key} - Calculating...")
-    
+
+    logger.info("❌ Cache MISS for adherence %s - Calculating...", cache_key)
+
     # Get current month's budget
     current_month = datetime.now().date().replace(day=1)
-    
-    try:
-        budget = BudgetRecommendation.objects.get(
-            user=user,
-            month=current_month,
-            is_active=True
+
+    # Prefetch the category budgets so the scoring and totals below
+    # work from one query instead of re-fetching the relation; the
+    # scoring only needs the category and its limit. first() returns
+    # None for absent budgets without DoesNotExist exception machinery
+    budget = BudgetRecommendation.objects.prefetch_related(
+        Prefetch(
+            'category_budgets',
+            queryset=CategoryBudget.objects.only('category', 'recommended_limit')
         )
-    except BudgetRecommendation.DoesNotExist:
+    ).only('id', 'month').filter(
+        user=user,
+        month=current_month,
+        is_active=True
+    ).first()
+    if budget is None:
+        # Short negative-result TTL: a budget may be generated any time
+        cache.set(cache_key, None, 60)
         return None
     
-    # Get actual spending (OPTIMIZED)
+    # Get actual spending from the shared (cached) per-category helper
     month_end = datetime.now().date()
-    actual_spending = Transaction.objects.filter(
-        user=user,
-        date__gte=current_month,
-        date__lte=month_end,
-        is_anomaly=False
-    ).values('category').annotate(
-        total=Sum('amount')
-    )
-    
-    actual_by_category = {item['category']: Decimal(str(item['total'])) for item in actual_spending}
+    actual_by_category = _monthly_actuals(user, current_month, month_end)
     
     # Calculate scores
+    cat_budgets = list(budget.category_budgets.all())
     category_scores = []
     category_insights = []
-    
-    for cat_budget in budget.category_budgets.all():
-        actual = actual_by_category.get(cat_budget.category, Decimal('0'))
+
+    for cat_budget in cat_budgets:
+        actual = actual_by_category.get(cat_budget.category, _ZERO)
         budgeted = cat_budget.recommended_limit
-        
+        category_name = CATEGORY_DISPLAY.get(cat_budget.category, cat_budget.category)
+
         if budgeted == 0:
             continue
         
@@ -412,12 +603,12 @@ def calculate_budget_adherence(user):
             score = 100
             insight_type = 'success'
             under_amount = 100 - percentage_used
-            message = f"✅ {cat_budget.get_category_display()}:under budget!"
+            message = f"✅ {category_name}:under budget!"
             
         elif percentage_used <= 100:
             score = 80
             insight_type = 'warning'
-            message = f"⚠️ {cat_budget.get_category_display()}:. Stay mindful!"
+            message = f"⚠️ {category_name}:. Stay mindful!"
             
         else:
             # FIX: Correct over-budget calculation
@@ -427,11 +618,11 @@ def calculate_budget_adherence(user):
             
             # Show actual overspend amount
             over_amount = actual - budgeted
-            message = f"🚨 {cat_budget.get_category_display()}: ₹{over_amount:,.0f} over budget!"
+            message = f"🚨 {category_name}: ₹{over_amount:,.0f} over budget!"
         
         category_scores.append(score)
         category_insights.append({
-            'category': cat_budget.get_category_display(),
+            'category': category_name,
             'type': insight_type,
             'message': message,
             'budgeted': float(budgeted),
@@ -452,17 +643,17 @@ def calculate_budget_adherence(user):
     else:
         message = "🚨 Alert: Significant budget overruns detected."
     
-    # Total calculations
-    total_budgeted = sum(cb.recommended_limit for cb in budget.category_budgets.all())
+    # Total calculations (from the rows already fetched above)
+    total_budgeted = sum(cb.recommended_limit for cb in cat_budgets)
     total_spent = sum(actual_by_category.values())
     
     result = {
         'score': round(overall_score, 1),
         'message': message,
-        'category_insights': sorted(
-            category_insights, 
-            key=lambda x: ['danger', 'warning', 'success'].index(x['type'])
-        )[:3],  # Top 3 most critical
+        'category_insights': heapq.nsmallest(
+            3, category_insights,
+            key=lambda x: INSIGHT_ORDER[x['type']]
+        ),  # Top 3 most critical
         'total_budgeted': total_budgeted,
         'total_spent': total_spent,
         'on_track': overall_score >= 70
@@ -470,13 +661,6 @@ def calculate_budget_adherence(user):
     
     # Cache for 10 minutes
     cache.set(cache_key, result, 600)
-    logger.info(f"💾 Cached adherence for {cache_key}")
-    
-    return result
+    logger.info("💾 Cached adherence for %s", cache_key)
 
-    
-    # Cache for 10 minutes (shorter because it changes frequently)
-    cache.set(cache_key, result, 600)
-    logger.info(f"💾 Cached adherence for {cache_key}")
-    
     return result
\ No newline at end of file
@@ -1,12 +1,17 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import authenticate, login
+from django.core.cache import cache
+from django.db.models import Sum, Count, Max
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import etag
 from django.utils.decorators import method_decorator
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 from .models import (
     Transaction,
@@ -19,7 +24,39 @@ from .serializers import (
     BudgetRecommendationSerializer,
     BudgetComparisonSerializer
 )
-from .services import BudgetCalculationService
+from .services import BudgetCalculationService, calculate_budget_adherence
+
+
+@lru_cache(maxsize=256)
+def _parse_month(value):
+    """Parse a YYYY-MM-DD string, memoized: clients mostly resend the
+    same handful of month strings and strptime is surprisingly costly.
+    Raises ValueError for malformed input (not cached)."""
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _transactions_etag(request, *args, **kwargs):
+    """ETag from the user's newest transaction edit, so conditional GETs
+    of transaction-derived data can 304 without serializing anything."""
+    latest = Transaction.objects.filter(user=request.user).aggregate(
+        m=Max('updated_at')
+    )['m']
+    return f'{request.user.id}:{latest.timestamp() if latest else 0}'
+
+
+def _budgets_etag(request, *args, **kwargs):
+    """ETag from the user's newest budget write. updated_at moves on
+    every regeneration (generated_at is auto_now_add and never does), so
+    a regenerated budget for the same month invalidates the tag."""
+    latest = BudgetRecommendation.objects.filter(user=request.user).aggregate(
+        m=Max('updated_at')
+    )['m']
+    return f'{request.user.id}:{latest.timestamp() if latest else 0}'
+
+
+def _adherence_etag(request, *args, **kwargs):
+    # Adherence moves when either spending or the budget changes
+    return f'{_transactions_etag(request)}:{_budgets_etag(request)}'
 
 
 @api_view(['POST'])
@@ -54,19 +91,34 @@ def login_view(request):
         )
 
 
+class TransactionCursorPagination(CursorPagination):
+    """Cursor pagination over the (user, date) index so listing a heavy
+    user's history stays bounded in memory and query cost."""
+    ordering = ('-date', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class TransactionViewSet(viewsets.ModelViewSet):
     """
     API endpoints for managing transactions
     """
     serializer_class = TransactionSerializer
-    permission_classes = []
-    
+    permission_classes = [IsAuthenticated]
+    pagination_class = TransactionCursorPagination
+
     def get_queryset(self):
         """Return transactions for the current user only"""
-        if not self.request.user.is_authenticated:
-            return Transaction.objects.none()
-        return Transaction.objects.filter(user=self.request.user)
+        # Fetch just the columns the serializer renders. No
+        # select_related needed: user is never serialized and category
+        # is a plain CharField, so list endpoints stay at one query
+        return Transaction.objects.filter(user=self.request.user).only(
+            'id', 'amount', 'date', 'merchant_name', 'category',
+            'expense_type', 'transaction_source', 'description',
+            'is_anomaly', 'created_at', 'user_id'
+        )
     
     def perform_create(self, serializer):
         """Save transaction with current user"""
@@ -75,29 +127,43 @@ class TransactionViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def recent(self, request):
         """Get recent transactions (last 30 days)"""
-        if not request.user.is_authenticated:
-            return Response({'detail': 'Authentication required'}, status=401)
-            
-        from datetime import timedelta
         thirty_days_ago = datetime.now().date() - timedelta(days=30)
-        recent_transactions = self.get_queryset().filter(date__gte=thirty_days_ago)
-        serializer = self.get_serializer(recent_transactions, many=True)
+        # Explicit -date ordering rides the (user, date) composite index
+        # as a backward range scan; the cap keeps a heavy user's month
+        # from ballooning the response
+        recent_transactions = self.get_queryset().filter(
+            date__gte=thirty_days_ago
+        ).order_by('-date', '-id')
+        page = self.paginate_queryset(recent_transactions)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(recent_transactions[:500], many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(_transactions_etag))
     def by_category(self, request):
         """Get transactions grouped by category"""
-        if not request.user.is_authenticated:
-            return Response({'detail': 'Authentication required'}, status=401)
-            
-        from django.db.models import Sum, Count
-        
-        category_summary = self.get_queryset().values('category').annotate(
-            total_amount=Sum('amount'),
-            transaction_count=Count('id')
-        ).order_by('-total_amount')
-        
-        return Response(category_summary)
+        # The aggregation only changes when a transaction does, so key
+        # the cached result by the newest edit: one cheap Max probe on a
+        # hit instead of the full GROUP BY scan
+        latest = Transaction.objects.filter(user=request.user).aggregate(
+            m=Max('updated_at')
+        )['m']
+        version = latest.timestamp() if latest else 0
+        cache_key = f'txn_by_cat_{request.user.id}_{version}'
+
+        category_summary = cache.get_or_set(cache_key, lambda: list(
+            self.get_queryset().values('category').annotate(
+                total_amount=Sum('amount'),
+                transaction_count=Count('id')
+            ).order_by('-total_amount')
+        ), 300)
+
+        response = Response(category_summary)
+        response['Cache-Control'] = 'private, max-age=60'
+        return response
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -106,42 +172,45 @@ class UserFinancialProfileViewSet(viewsets.ModelViewSet):
     API endpoints for user financial profile
     """
     serializer_class = UserFinancialProfileSerializer
-    permission_classes = []
-    
+    permission_classes = [IsAuthenticated]
+
     def get_queryset(self):
         """Return profile for current user only"""
-        if not self.request.user.is_authenticated:
-            return UserFinancialProfile.objects.none()
         return UserFinancialProfile.objects.filter(user=self.request.user)
-    
+
+    def _get_profile(self, user):
+        """get_or_create the profile once per request; anything else in
+        the same request/response cycle reuses the loaded instance"""
+        profile = getattr(user, '_profile_cache', None)
+        if profile is None:
+            profile, _ = UserFinancialProfile.objects.get_or_create(
+                user=user,
+                defaults={
+                    'monthly_income': 50000.00,
+                    'income_stability_score': 85.0,
+                    'expense_volatility_score': 0.0,
+                    'savings_confidence_indicator': 0.0
+                }
+            )
+            user._profile_cache = profile
+        return profile
+
     def list(self, request, *args, **kwargs):
         """Override list to return single profile"""
-        if not request.user.is_authenticated:
-            return Response({'detail': 'Authentication required'}, status=401)
-            
-        profile, created = UserFinancialProfile.objects.get_or_create(
-            user=request.user,
-            defaults={
-                'monthly_income': 50000.00,
-                'income_stability_score': 85.0,
-                'expense_volatility_score': 0.0,
-                'savings_confidence_indicator': 0.0
-            }
-        )
-        serializer = self.get_serializer(profile)
+        serializer = self.get_serializer(self._get_profile(request.user))
         return Response([serializer.data])
     
     def update(self, request, *args, **kwargs):
         """Update user profile"""
-        if not request.user.is_authenticated:
-            return Response({'error': 'Authentication required'}, status=401)
-        
         instance = self.get_object()
-        
+
         if 'monthly_income' in request.data:
             instance.monthly_income = request.data['monthly_income']
             instance.save()
-        
+
+        # Keep the per-request cache coherent with what was just saved
+        request.user._profile_cache = instance
+
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -152,26 +221,28 @@ class BudgetRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
     API endpoints for budget recommendations
     """
     serializer_class = BudgetRecommendationSerializer
-    permission_classes = []
-    
+    permission_classes = [IsAuthenticated]
+
     def get_queryset(self):
         """Return budget recommendations for current user only"""
-        if not self.request.user.is_authenticated:
-            return BudgetRecommendation.objects.none()
-        return BudgetRecommendation.objects.filter(user=self.request.user)
+        queryset = BudgetRecommendationSerializer.setup_eager_loading(
+            BudgetRecommendation.objects.filter(user=self.request.user)
+        )
+        if self.action == 'compare':
+            # The comparison reads only the month and the prefetched
+            # category budgets; skip the savings_reason text blob
+            queryset = queryset.defer('savings_reason')
+        return queryset
     
     @action(detail=False, methods=['post'])
     def generate(self, request):
         """Generate a new budget recommendation"""
-        if not request.user.is_authenticated:
-            return Response({'error': 'Authentication required'}, status=401)
-            
         target_month_str = request.data.get('target_month')
         target_month = None
         
         if target_month_str:
             try:
-                target_month = datetime.strptime(target_month_str, '%Y-%m-%d').date()
+                target_month = _parse_month(target_month_str)
             except ValueError:
                 return Response(
                     {'error': 'Invalid date format. Use YYYY-MM-DD'},
@@ -180,12 +251,12 @@ class BudgetRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
         
         try:
             service = BudgetCalculationService(request.user)
-            budget = service.generate_budget_recommendation(target_month)
-            serializer = self.get_serializer(budget)
-            
+            # The service returns the serialized payload (cached or fresh)
+            budget_data = service.generate_budget_recommendation(target_month)
+
             return Response({
                 'message': 'Budget recommendation generated successfully',
-                'budget': serializer.data
+                'budget': budget_data
             }, status=status.HTTP_201_CREATED)
         
         except ValueError as e:
@@ -200,11 +271,9 @@ class BudgetRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
             )
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(_budgets_etag))
     def latest(self, request):
         """Get the most recent budget recommendation"""
-        if not request.user.is_authenticated:
-            return Response({'error': 'Authentication required'}, status=401)
-            
         latest_budget = self.get_queryset().order_by('-month', '-generated_at').first()
         
         if not latest_budget:
@@ -214,14 +283,13 @@ class BudgetRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
             )
         
         serializer = self.get_serializer(latest_budget)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        response['Cache-Control'] = 'private, max-age=60'
+        return response
     
     @action(detail=True, methods=['get'])
     def compare(self, request, pk=None):
         """Compare recommended budget vs actual spending"""
-        if not request.user.is_authenticated:
-            return Response({'error': 'Authentication required'}, status=401)
-            
         budget = self.get_object()
         
         try:
@@ -238,35 +306,36 @@ class BudgetRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
             )
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(_budgets_etag))
     def summary(self, request):
         """Get a summary of all budget recommendations"""
-        if not request.user.is_authenticated:
-            return Response({'error': 'Authentication required'}, status=401)
-            
-        budgets = self.get_queryset().order_by('-month')[:6]
-        
-        summary = []
-        for budget in budgets:
-            summary.append({
-                'month': budget.month.strftime('%B %Y'),
-                'total_budget': budget.total_recommended_budget,
-                'recommended_savings': budget.recommended_savings,
-                'generated_at': budget.generated_at
-            })
-        
-        return Response({
+        # Project just the four columns the summary shows; no model
+        # instances get built. prefetch_related(None) drops the child
+        # prefetches from the eager-loaded base queryset -- they cannot
+        # apply to dict rows
+        rows = self.get_queryset().prefetch_related(None).order_by('-month').values(
+            'month', 'total_recommended_budget', 'recommended_savings',
+            'generated_at'
+        )[:6]
+
+        summary = [{
+            'month': row['month'].strftime('%B %Y'),
+            'total_budget': row['total_recommended_budget'],
+            'recommended_savings': row['recommended_savings'],
+            'generated_at': row['generated_at']
+        } for row in rows]
+
+        response = Response({
             'count': len(summary),
             'budgets': summary
         })
+        response['Cache-Control'] = 'private, max-age=60'
+        return response
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(_adherence_etag))
     def adherence(self, request):
         """Get budget adherence score and insights"""
-        if not request.user.is_authenticated:
-            return Response({'error': 'Authentication required'}, status=401)
-        
-        from .services import calculate_budget_adherence
-        
         adherence_data = calculate_budget_adherence(request.user)
         
         if not adherence_data:
@@ -274,4 +343,6 @@ class BudgetRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
                 'message': 'No active budget found for current month'
             }, status=404)
         
-        return Response(adherence_data)
\ No newline at end of file
+        response = Response(adherence_data)
+        response['Cache-Control'] = 'private, max-age=60'
+        return response
\ No newline at end of file